@@ -1,6 +1,8 @@
+from typing import Optional
+
 import numpy as np
 import pandas as pd
-from fastapi import FastAPI, Form, Request
+from fastapi import BackgroundTasks, FastAPI, Form, HTTPException, Request
 from fastapi.templating import Jinja2Templates
 
 from src.misc import (
@@ -11,9 +13,12 @@ from src.misc import (
     TestPreparationCourse,
 )
 from src.pipeline.predict_pipeline import PredictPipeline
+from src.pipeline.shadow_pipeline import ShadowPipeline
 
 app = FastAPI()
 templates = Jinja2Templates(directory="templates")
+predict_pipeline = PredictPipeline()
+shadow_pipeline = ShadowPipeline()
 
 
 @app.get("/")
@@ -31,6 +36,7 @@ async def index(request: Request):
 
 @app.post("/predictdata")
 async def predict_datapoint(
+    background_tasks: BackgroundTasks,
     gender: GenderEnum = Form(title="Gender", description="Select your gender"),
     race_ethnicity: RaceEthnicity = Form(
         title="Race Or Ethnicity", description="Select your race or ethinicity"
@@ -48,7 +54,11 @@ async def predict_datapoint(
 ):
     """Predict the math score based on input data.
 
+    A configurable fraction of requests is mirrored to the candidate model on a
+    background task, which runs after the response has been sent.
+
     Args:
+        background_tasks (BackgroundTasks): Tasks run after the response is sent.
         gender (GenderEnum): Gender of the student.
         race_ethnicity (RaceEthnicity): Race or ethnicity of the student.
         parental_level_of_education (Parental_Level_Of_Eductaion): Parental level of education.
@@ -71,7 +81,102 @@ async def predict_datapoint(
     }
 
     pred_df = pd.DataFrame(data)
-    predict_pipeline = PredictPipeline()
-    result = predict_pipeline.predict(pred_df)
+    result, primary_latency_ms = predict_pipeline.predict_with_latency(pred_df)
+
+    if shadow_pipeline.should_mirror():
+        background_tasks.add_task(
+            shadow_pipeline.evaluate,
+            pred_df,
+            result[0],
+            primary_latency_ms,
+            predict_pipeline.predict_pipeline_config.serving_model,
+        )
+
     output = f"The predicted output is {np.round(result[0])}"
     return output
+
+
+@app.get("/shadow/summary")
+async def shadow_summary():
+    """Summarize the candidate model's agreement and latency under live traffic.
+
+    Returns:
+        dict: Shadow evaluation statistics over the most recent mirrored requests.
+    """
+    return shadow_pipeline.summary()
+
+
+@app.post("/predictscores")
+async def predict_scores(
+    gender: GenderEnum = Form(title="Gender", description="Select your gender"),
+    race_ethnicity: RaceEthnicity = Form(
+        title="Race Or Ethnicity", description="Select your race or ethinicity"
+    ),
+    parental_level_of_education: Parental_Level_Of_Eductaion = Form(
+        title="Parental level of education",
+        description="Select level of your parent's education",
+    ),
+    lunch: Lunch = Form(title="Lunch", description="Enter Lunch type"),
+    test_preparation_course: TestPreparationCourse = Form(
+        title="Test preparation course", description="Enter test preparation course"
+    ),
+    math_score: Optional[int] = Form(
+        default=None, title="Math Score", description="Enter math score if known"
+    ),
+    reading_score: Optional[int] = Form(
+        default=None, title="Reading Score", description="Enter reading score if known"
+    ),
+    writing_score: Optional[int] = Form(
+        default=None, title="Writing Score", description="Enter writing score if known"
+    ),
+):
+    """Predict every target score of the multi-target bundle in one pass.
+
+    Scores are only needed when the bundle was trained with them as features;
+    a missing one is rejected with a 422 naming the field.
+
+    Args:
+        gender (GenderEnum): Gender of the student.
+        race_ethnicity (RaceEthnicity): Race or ethnicity of the student.
+        parental_level_of_education (Parental_Level_Of_Eductaion): Parental level of education.
+        lunch (Lunch): Type of lunch.
+        test_preparation_course (TestPreparationCourse): Test preparation course.
+        math_score (Optional[int]): Math score of the student.
+        reading_score (Optional[int]): Reading score of the student.
+        writing_score (Optional[int]): Writing score of the student.
+
+    Raises:
+        HTTPException: If a feature the bundle was trained on is not provided.
+
+    Returns:
+        dict: Predicted score for each target.
+    """
+    data = {
+        "gender": [gender.value],
+        "race_ethnicity": [race_ethnicity.value],
+        "parental_level_of_education": [parental_level_of_education.value],
+        "lunch": [lunch.value],
+        "test_preparation_course": [test_preparation_course.value],
+    }
+    for column, score in (
+        ("math_score", math_score),
+        ("reading_score", reading_score),
+        ("writing_score", writing_score),
+    ):
+        if score is not None:
+            data[column] = [score]
+
+    missing = [
+        column
+        for column in predict_pipeline.get_multi_target_feature_names()
+        if column not in data
+    ]
+    if missing:
+        raise HTTPException(
+            status_code=422,
+            detail=f"Missing form field(s) required by the model: {', '.join(missing)}",
+        )
+
+    pred_df = pd.DataFrame(data)
+    result = predict_pipeline.predict_all(pred_df)
+    return {target: float(np.round(preds[0])) for target, preds in result.items()}
@@ -9,7 +9,7 @@ from src.components.data_transformation import DataTransformation
 from src.components.model_trainer import ModelTrainer
 from src.exception import CustomException
 from src.logger import logging
-from src.utils import split_data
+from src.utils import load_json, split_data, update_json
 
 
 @dataclass
@@ -17,19 +17,32 @@ class DataIngestionConfig:
     train_data_path: str = os.path.join("artifacts", "train.csv")
     test_data_path: str = os.path.join("artifacts", "test.csv")
     raw_data_path: str = os.path.join("artifacts", "raw.csv")
+    train_delta_path: str = os.path.join("artifacts", "train_delta.csv")
+    test_delta_path: str = os.path.join("artifacts", "test_delta.csv")
+    source_data_path: str = os.path.join("notebook", "data", "stud.csv")
+    manifest_file_path: str = os.path.join("artifacts", "manifest.json")
+    # Deltas smaller than this go entirely to the training split.
+    min_rows_to_split: int = 5
+    # Isolated runs (candidate, multi-target) keep their own splits and must
+    # not move the watermark of the served model's splits.
+    track_watermark: bool = True
 
 
 class DataIngestion:
-    def __init__(self):
+    def __init__(self, ingestion_config=None):
         """Initiate data ingestion process.
 
+        Args:
+            ingestion_config (DataIngestionConfig, optional): Paths to ingest into.
+                Defaults to the served model's splits.
+
         Raises:
             CustomException: Raised if any exception occurs during the process.
 
         Returns:
             Tuple[str, str]: Tuple containing paths of the train and test data.
         """
-        self.ingestion_config = DataIngestionConfig()
+        self.ingestion_config = ingestion_config or DataIngestionConfig()
 
     def initiate_data_ingestion(self):
         """_summary_
@@ -43,7 +56,7 @@ class DataIngestion:
         logging.info("Entered in data ingestion method or component successfully")
         try:
             logging.info("Reading dataset initiated")
-            df = pd.read_csv("notebook\data\stud.csv")
+            df = pd.read_csv(self.ingestion_config.source_data_path)
             logging.info("Reading dataset completed")
 
             os.makedirs(
@@ -67,6 +80,11 @@ class DataIngestion:
             )
             logging.info("Creation of train.csv and test.csv completed")
 
+            if self.ingestion_config.track_watermark:
+                update_json(
+                    file_path=self.ingestion_config.manifest_file_path,
+                    updates={"ingestion": {"rows_ingested": len(df)}},
+                )
             logging.info("Ingestion of the data is completed")
 
             return (
@@ -76,6 +94,84 @@ class DataIngestion:
         except Exception as e:
             raise CustomException(e, sys)
 
+    def initiate_incremental_ingestion(self):
+        """Ingest only the rows appended to the source since the last run.
+
+        The number of source rows already ingested is kept as a watermark in the
+        artifacts manifest. New rows are split and written to delta files only;
+        `commit_incremental_ingestion` appends them to raw.csv, train.csv and
+        test.csv and moves the watermark once they have been trained on.
+
+        Raises:
+            CustomException: Raised if any exception occurs during the process.
+
+        Returns:
+            Optional[Tuple[str, str, int]]: Paths of the training and test deltas
+                and the watermark to commit, or None if there are no new rows.
+        """
+        logging.info("Entered in incremental data ingestion method")
+        try:
+            config = self.ingestion_config
+            manifest = load_json(file_path=config.manifest_file_path)
+            rows_ingested = manifest["ingestion"]["rows_ingested"]
+
+            logging.info(f"Reading dataset rows after watermark {rows_ingested}")
+            new_df = pd.read_csv(
+                config.source_data_path, skiprows=range(1, rows_ingested + 1)
+            )
+            if new_df.empty:
+                logging.info("No new rows to ingest")
+                return None
+
+            if len(new_df) >= config.min_rows_to_split:
+                train_set, test_set = split_data(new_df)
+            else:
+                train_set, test_set = new_df, new_df.iloc[:0]
+
+            logging.info(f"Writing {len(new_df)} new rows to the delta files")
+            train_set.to_csv(config.train_delta_path, index=False, header=True)
+            test_set.to_csv(config.test_delta_path, index=False, header=True)
+            logging.info("Incremental ingestion of the data is completed")
+
+            return (
+                config.train_delta_path,
+                config.test_delta_path,
+                rows_ingested + len(new_df),
+            )
+        except Exception as e:
+            raise CustomException(e, sys)
+
+    def commit_incremental_ingestion(self, rows_ingested):
+        """Append the delta files to the data artifacts and move the watermark.
+
+        Args:
+            rows_ingested (int): Watermark returned by `initiate_incremental_ingestion`.
+
+        Raises:
+            CustomException: Raised if any exception occurs during the process.
+        """
+        try:
+            config = self.ingestion_config
+            train_set = pd.read_csv(config.train_delta_path)
+            test_set = pd.read_csv(config.test_delta_path)
+
+            logging.info("Appending delta rows to the data artifacts")
+            for df in (train_set, test_set):
+                df.to_csv(config.raw_data_path, mode="a", index=False, header=False)
+            train_set.to_csv(
+                config.train_data_path, mode="a", index=False, header=False
+            )
+            test_set.to_csv(config.test_data_path, mode="a", index=False, header=False)
+
+            update_json(
+                file_path=config.manifest_file_path,
+                updates={"ingestion": {"rows_ingested": rows_ingested}},
+            )
+            os.remove(config.train_delta_path)
+            os.remove(config.test_delta_path)
+        except Exception as e:
+            raise CustomException(e, sys)
+
 
 # ----------------------------------For testing purpose only--------------------------------------------------:
 
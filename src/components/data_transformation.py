@@ -1,4 +1,6 @@
 import sys
+from dataclasses import dataclass, field
+from typing import List
 
 import numpy as np
 import pandas as pd
@@ -11,10 +13,31 @@ from src.exception import CustomException
 from src.logger import logging
 
 
+@dataclass
+class DataTransformationConfig:
+    target_column_name: str = "math_score"
+    # Score columns not used as targets are the numerical features.
+    score_columns: List[str] = field(
+        default_factory=lambda: ["writing_score", "reading_score", "math_score"]
+    )
+
+
 class DataTransformation:
-    def get_data_transformer_object(self):
+    def __init__(self, data_transformation_config=None):
+        """
+        Initialize the DataTransformation object.
+        """
+        self.data_transformation_config = (
+            data_transformation_config or DataTransformationConfig()
+        )
+
+    def get_data_transformer_object(self, numerical_columns=None):
         """Get the data transformer object.
 
+        Args:
+            numerical_columns (list, optional): Numerical feature columns.
+                Defaults to the writing and reading scores.
+
         Raises:
             CustomException: If an error occurs during the process.
 
@@ -22,7 +45,8 @@ class DataTransformation:
             ColumnTransformer: Data transformer object.
         """
         try:
-            numerical_columns = ["writing_score", "reading_score"]
+            if numerical_columns is None:
+                numerical_columns = ["writing_score", "reading_score"]
             categorical_columns = [
                 "gender",
                 "race_ethnicity",
@@ -52,7 +76,10 @@ class DataTransformation:
                 [
                     ("num_pipeline", num_pipeline, numerical_columns),
                     ("cat_pipeline", cat_pipeline, categorical_columns),
-                ]
+                ],
+                # Always dense: categorical-only feature sets would otherwise
+                # fall under the default sparse threshold.
+                sparse_threshold=0,
             )
 
             return preprocessor
@@ -60,18 +87,27 @@ class DataTransformation:
         except Exception as e:
             raise CustomException(e, sys)
 
-    def initiate_data_transformation(self, train_path, test_path):
+    def initiate_data_transformation(
+        self, train_path, test_path, target_columns=None
+    ):
         """Initiate data transformation.
 
+        Several targets share a single preprocessor fit and feature matrix, with
+        one target column per target appended in order. The fitted preprocessor
+        is returned rather than saved, so it is published together with the
+        model trained on it.
+
         Args:
             train_path (str): Path to the training data.
             test_path (str): Path to the test data.
+            target_columns (list, optional): Target columns. Defaults to the math score.
 
         Raises:
             CustomException: If an error occurs during the process.
 
         Returns:
-            Tuple[np.ndarray, np.ndarray]: Transformed training and test arrays.
+            Tuple[np.ndarray, np.ndarray, ColumnTransformer]: Transformed training
+                and test arrays and the fitted preprocessor object.
         """
         try:
             logging.info("Reading train and test data initiated")
@@ -79,18 +115,24 @@ class DataTransformation:
             test_df = pd.read_csv(test_path)
             logging.info("Reading train and test data completed")
 
+            config = self.data_transformation_config
+            if target_columns is None:
+                target_columns = [config.target_column_name]
+            numerical_columns = [
+                column
+                for column in config.score_columns
+                if column not in target_columns
+            ]
+
             logging.info("Obtaining preprocessing object")
-            preprocessing_obj = self.get_data_transformer_object()
+            preprocessing_obj = self.get_data_transformer_object(numerical_columns)
             logging.info("Preprocessor object obtained successfully")
 
-            target_column_name = "math_score"
-            numerical_columns = ["writing_score", "reading_score"]
-
-            input_feature_train_df = train_df.drop(columns=[target_column_name], axis=1)
-            target_feature_train_df = train_df[target_column_name]
+            input_feature_train_df = train_df.drop(columns=target_columns)
+            target_feature_train_df = train_df[target_columns]
 
-            input_feature_test_df = test_df.drop(columns=[target_column_name], axis=1)
-            target_feature_test_df = test_df[target_column_name]
+            input_feature_test_df = test_df.drop(columns=target_columns)
+            target_feature_test_df = test_df[target_columns]
 
             logging.info(
                 "Applying preprocessing object on training dataframe and testing dataframe"
@@ -112,7 +154,116 @@ class DataTransformation:
                 "Concatenation features and labels for train and test dataset complete"
             )
 
-            return (train_arr, test_arr)
+            return (train_arr, test_arr, preprocessing_obj)
+
+        except Exception as e:
+            raise CustomException(e, sys)
+
+    def get_numerical_pipeline(self, preprocessing_obj):
+        """Get the fitted numerical pipeline and its columns from a preprocessor.
+
+        Args:
+            preprocessing_obj (ColumnTransformer): Fitted data transformer object.
+
+        Returns:
+            Tuple[Pipeline, list]: Numerical pipeline and numerical columns.
+        """
+        numerical_columns = next(
+            columns
+            for name, _, columns in preprocessing_obj.transformers_
+            if name == "num_pipeline"
+        )
+        return preprocessing_obj.named_transformers_["num_pipeline"], numerical_columns
+
+    def measure_drift(self, preprocessing_obj, delta_df):
+        """Compare a batch of new rows with the frozen numerical statistics.
+
+        Args:
+            preprocessing_obj (ColumnTransformer): Fitted data transformer object.
+            delta_df (pd.DataFrame): Newly ingested rows.
+
+        Returns:
+            dict: Number of rows, the largest shift of the batch mean in frozen
+                standard deviations with its z statistic, and the most extreme
+                ratio between the batch and frozen standard deviations.
+        """
+        num_pipeline, numerical_columns = self.get_numerical_pipeline(
+            preprocessing_obj
+        )
+        frozen_scaler = num_pipeline.named_steps["scaler"]
+        values = num_pipeline.named_steps["imputer"].transform(
+            delta_df[numerical_columns]
+        )
+        rows = len(values)
+
+        mean_shift = np.abs(values.mean(axis=0) - frozen_scaler.mean_)
+        mean_shift = mean_shift / frozen_scaler.scale_
+        if rows > 1:
+            std_ratio = values.std(axis=0, ddof=1) / frozen_scaler.scale_
+            std_ratio = np.maximum(std_ratio, 1 / np.maximum(std_ratio, 1e-12))
+        else:
+            std_ratio = np.ones_like(mean_shift)
+
+        return {
+            "rows": rows,
+            "mean_shift": float(mean_shift.max()),
+            "mean_shift_z": float(mean_shift.max() * np.sqrt(rows)),
+            "std_ratio": float(std_ratio.max()),
+        }
+
+    def initiate_incremental_transformation(
+        self, preprocessing_obj, train_delta_path, test_delta_path, train_path, test_path
+    ):
+        """Transform newly ingested rows with the fitted preprocessor.
+
+        The fitted preprocessor is kept frozen on purpose: the appended trees of
+        the boosting and forest models split on the frozen scale, and the models
+        refitted on the full data (Linear Regression, Decision Tree, AdaBoost) are
+        invariant to the per-column affine rescaling an updated scaler would
+        apply. Its statistics are refreshed by the next full run, which a drift
+        of the new training rows against them triggers.
+
+        Args:
+            preprocessing_obj (ColumnTransformer): Preprocessor published with the model.
+            train_delta_path (str): Path to the newly ingested training rows.
+            test_delta_path (str): Path to the newly ingested test rows.
+            train_path (str): Path to the training data already ingested.
+            test_path (str): Path to the test data already ingested.
+
+        Raises:
+            CustomException: If an error occurs during the process.
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray, np.ndarray, dict]: Transformed new
+                training rows, full training and test arrays including the new
+                rows, and the drift report of `measure_drift`.
+        """
+        try:
+            config = self.data_transformation_config
+            target_column_name = config.target_column_name
+
+            train_delta_df = pd.read_csv(train_delta_path)
+            drift = self.measure_drift(preprocessing_obj, train_delta_df)
+            logging.info(f"Drift of the new training rows is {drift}")
+
+            train_df = pd.concat(
+                [pd.read_csv(train_path), train_delta_df], ignore_index=True
+            )
+            test_df = pd.concat(
+                [pd.read_csv(test_path), pd.read_csv(test_delta_path)],
+                ignore_index=True,
+            )
+
+            arrays = []
+            for df in (train_delta_df, train_df, test_df):
+                input_feature_arr = preprocessing_obj.transform(
+                    df.drop(columns=[target_column_name])
+                )
+                arrays.append(
+                    np.c_[input_feature_arr, np.array(df[target_column_name])]
+                )
+
+            return (*arrays, drift)
 
         except Exception as e:
             raise CustomException(e, sys)
@@ -0,0 +1,209 @@
+import itertools
+import os
+import sys
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+from sklearn.metrics import mean_squared_error, r2_score
+
+from src.exception import CustomException
+from src.logger import logging
+from src.misc import (
+    GenderEnum,
+    Lunch,
+    Parental_Level_Of_Eductaion,
+    RaceEthnicity,
+    TestPreparationCourse,
+)
+from src.utils import load_object, save_json, update_json
+
+
+@dataclass
+class ModelDistillerConfig:
+    student_file_path: str = os.path.join("artifacts", "student.json")
+    manifest_file_path: str = os.path.join("artifacts", "manifest.json")
+    target_column_name: str = "math_score"
+
+
+# The student is piecewise linear: one (intercept, reading, writing) row of
+# coefficients for every combination of categorical levels, so serving is a
+# table lookup followed by a three term dot product.
+STUDENT_CATEGORICAL_LEVELS = {
+    "gender": [level.value for level in GenderEnum],
+    "race_ethnicity": [level.value for level in RaceEthnicity],
+    "parental_level_of_education": [
+        level.value for level in Parental_Level_Of_Eductaion
+    ],
+    "lunch": [level.value for level in Lunch],
+    "test_preparation_course": [level.value for level in TestPreparationCourse],
+}
+STUDENT_NUMERICAL_COLUMNS = ["reading_score", "writing_score"]
+
+
+def prepare_student(student):
+    """Build the lookup tables used to serve a student model.
+
+    Args:
+        student (dict): Student model as exported by `ModelDistiller`.
+
+    Returns:
+        dict: The student with a level to code table per categorical column and
+            its coefficients as an array.
+    """
+    return {
+        **student,
+        "level_codes": {
+            column: {level: i for i, level in enumerate(levels)}
+            for column, levels in student["categorical_levels"].items()
+        },
+        "coefficient_array": np.asarray(student["coefficients"]),
+    }
+
+
+def student_predict(student, features):
+    """Predict the target variable with a distilled student model.
+
+    Args:
+        student (dict): Student model as returned by `prepare_student`.
+        features (pd.DataFrame): Input features for prediction.
+
+    Raises:
+        ValueError: If a categorical feature has a level unknown to the student.
+
+    Returns:
+        np.ndarray: Predicted target variable.
+    """
+    index = [0] * len(features)
+    for column, level_codes in student["level_codes"].items():
+        n_levels = len(level_codes)
+        try:
+            index = [
+                i * n_levels + level_codes[level]
+                for i, level in zip(index, features[column].tolist())
+            ]
+        except KeyError:
+            raise ValueError(f"Unknown level in column {column} for student model")
+
+    scores = features[student["numerical_columns"]].to_numpy(dtype=np.float64)
+    rows = student["coefficient_array"][index]
+    return rows[:, 0] + np.einsum("ij,ij->i", rows[:, 1:], scores)
+
+
+class ModelDistiller:
+    def __init__(self):
+        """
+        Initialize the ModelDistiller object.
+        """
+        self.model_distiller_config = ModelDistillerConfig()
+
+    def get_domain_dataframe(self, train_df):
+        """Build the input domain the student is fitted on.
+
+        Every combination of categorical levels is crossed with every distinct
+        (reading, writing) pair seen in training, so the student learns the
+        teacher on realistic score pairs for all categories.
+
+        Args:
+            train_df (pd.DataFrame): Training data.
+
+        Returns:
+            Tuple[pd.DataFrame, np.ndarray]: Domain features, ordered by category
+                combination, and the distinct score pairs used for each combination.
+        """
+        score_pairs = (
+            train_df[STUDENT_NUMERICAL_COLUMNS].drop_duplicates().to_numpy()
+        )
+        combinations = list(itertools.product(*STUDENT_CATEGORICAL_LEVELS.values()))
+
+        domain_df = pd.DataFrame(
+            np.repeat(combinations, len(score_pairs), axis=0),
+            columns=list(STUDENT_CATEGORICAL_LEVELS),
+        )
+        tiled_pairs = np.tile(score_pairs, (len(combinations), 1))
+        for i, column in enumerate(STUDENT_NUMERICAL_COLUMNS):
+            domain_df[column] = tiled_pairs[:, i]
+
+        return domain_df, score_pairs
+
+    def initiate_model_distillation(self, train_path, test_path, model_path):
+        """Distill the trained model into a piecewise linear student.
+
+        Args:
+            train_path (str): Path to the training data.
+            test_path (str): Path to the test data.
+            model_path (str): Path to the trained (teacher) model and preprocessor bundle.
+
+        Raises:
+            CustomException: If an error occurs during the process.
+
+        Returns:
+            dict: Fidelity of the student against the teacher and the test set.
+        """
+        try:
+            config = self.model_distiller_config
+
+            logging.info("Loading teacher model, preprocessor and data")
+            bundle = load_object(file_path=model_path)
+            teacher, preprocessor = bundle["model"], bundle["preprocessor"]
+            train_df = pd.read_csv(train_path)
+            test_df = pd.read_csv(test_path)
+
+            logging.info("Querying teacher over the input domain")
+            domain_df, score_pairs = self.get_domain_dataframe(train_df)
+            teacher_domain = teacher.predict(preprocessor.transform(domain_df))
+
+            logging.info("Fitting piecewise linear student on teacher predictions")
+            # The design matrix is shared by every category combination, so a
+            # single least squares call fits all of them at once.
+            design = np.c_[np.ones(len(score_pairs)), score_pairs]
+            targets = teacher_domain.reshape(-1, len(score_pairs)).T
+            coefficients = np.linalg.lstsq(design, targets, rcond=None)[0].T
+
+            student = {
+                "categorical_levels": STUDENT_CATEGORICAL_LEVELS,
+                "numerical_columns": STUDENT_NUMERICAL_COLUMNS,
+                "coefficients": coefficients.tolist(),
+            }
+
+            logging.info("Measuring student fidelity")
+            prepared_student = prepare_student(student)
+            student_domain = student_predict(prepared_student, domain_df)
+            input_test_df = test_df.drop(columns=[config.target_column_name])
+            ytest = test_df[config.target_column_name].to_numpy()
+            teacher_test = teacher.predict(preprocessor.transform(input_test_df))
+            student_test = student_predict(prepared_student, input_test_df)
+
+            fidelity = {
+                "domain_rows": int(len(domain_df)),
+                "domain_r2_vs_teacher": r2_score(teacher_domain, student_domain),
+                "domain_rmse_vs_teacher": float(
+                    np.sqrt(mean_squared_error(teacher_domain, student_domain))
+                ),
+                "domain_max_abs_error_vs_teacher": float(
+                    np.max(np.abs(teacher_domain - student_domain))
+                ),
+                "test_r2_vs_teacher": r2_score(teacher_test, student_test),
+                "test_r2": r2_score(ytest, student_test),
+                "teacher_test_r2": r2_score(ytest, teacher_test),
+            }
+            student["fidelity"] = fidelity
+
+            save_json(file_path=config.student_file_path, obj=student)
+
+            update_json(
+                file_path=config.manifest_file_path,
+                updates={
+                    "student": {
+                        "file_path": config.student_file_path,
+                        "coefficient_shape": list(coefficients.shape),
+                        **fidelity,
+                    }
+                },
+            )
+            logging.info(f"Student model saved with fidelity {fidelity}")
+
+            return fidelity
+
+        except Exception as e:
+            raise CustomException(e, sys)
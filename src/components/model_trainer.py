@@ -1,6 +1,9 @@
+import copy
 import os
 import sys
 from dataclasses import dataclass
+from datetime import datetime
+from typing import Optional
 
 from catboost import CatBoostRegressor
 from sklearn.ensemble import (
@@ -15,27 +18,358 @@ from xgboost import XGBRegressor
 
 from src.exception import CustomException
 from src.logger import logging
-from src.utils import evaluate_models, save_object
+from src.utils import (
+    evaluate_model_costs,
+    evaluate_models,
+    load_json,
+    load_object,
+    save_object,
+    update_json,
+)
 
 
 @dataclass
 class ModelTrainerConfig:
-    trained_model_file_path = os.path.join("artifacts", "model.pkl")
+    trained_model_file_path: str = os.path.join("artifacts", "model.pkl")
+    manifest_file_path: str = os.path.join("artifacts", "manifest.json")
+    # Manifest section describing the trained model; "candidate" for shadowing.
+    manifest_model_key: str = "model"
+    # Selection policy: among models inside the serving budget, any model whose
+    # test R2 is within `r2_tolerance` of the best one is acceptable and the
+    # cheapest of those (single-row latency first, then size) is chosen.
+    min_r2_score: float = 0.6
+    r2_tolerance: float = 0.01
+    max_single_row_latency_ms: Optional[float] = None
+    max_batch_latency_ms: Optional[float] = None
+    max_model_size_kb: Optional[float] = None
+    latency_repeats: int = 20
+    # Incremental training: trees/rounds appended per update, and the largest
+    # test R2 drop, summed over updates since the last full run, accepted
+    # before a full model search is required instead.
+    incremental_estimators: int = 16
+    max_r2_drop: float = 0.02
+    # Multi-target models share one feature matrix without the other scores,
+    # so they explain far less variance than the single-target model.
+    multi_target_model_file_path: str = os.path.join(
+        "artifacts", "multi_target", "models.pkl"
+    )
+    multi_target_min_r2_score: float = 0.1
 
 
 class ModelTrainer:
-    def __init__(self):
+    def __init__(self, model_trainer_config=None):
         """
         Initialize the ModelTrainer object.
         """
-        self.model_trainer_config = ModelTrainerConfig()
+        self.model_trainer_config = model_trainer_config or ModelTrainerConfig()
+
+    def select_best_model(self, model_report, model_costs, min_r2_score=None):
+        """Select the model to serve according to the configured policy.
+
+        Args:
+            model_report (dict): Test R2 score for each model.
+            model_costs (dict): Serving cost for each model as returned by `evaluate_model_costs`.
+            min_r2_score (float, optional): R2 floor overriding the configured one.
+
+        Raises:
+            ValueError: If no model meets the R2 floor and the serving budget.
+
+        Returns:
+            Tuple[str, dict]: Name of the selected model and the selection record.
+        """
+        config = self.model_trainer_config
+        if min_r2_score is None:
+            min_r2_score = config.min_r2_score
+        budget = {
+            "single_row_latency_ms": config.max_single_row_latency_ms,
+            "batch_latency_ms": config.max_batch_latency_ms,
+            "model_size_kb": config.max_model_size_kb,
+        }
+
+        eligible = {}
+        for name, score in model_report.items():
+            if score < min_r2_score:
+                continue
+            if any(
+                limit is not None and model_costs[name][metric] > limit
+                for metric, limit in budget.items()
+            ):
+                continue
+            eligible[name] = score
+
+        if not eligible:
+            raise ValueError(
+                "Best model not found within the R2 floor and serving budget"
+            )
+
+        overall_best_name = max(model_report, key=model_report.get)
+        top_score = max(eligible.values())
+        within_tolerance = [
+            name
+            for name, score in eligible.items()
+            if score >= top_score - config.r2_tolerance
+        ]
+        best_model_name = min(
+            within_tolerance,
+            key=lambda name: (
+                model_costs[name]["single_row_latency_ms"],
+                model_costs[name]["model_size_kb"],
+            ),
+        )
+
+        selection = {
+            "policy": {
+                "min_r2_score": min_r2_score,
+                "r2_tolerance": config.r2_tolerance,
+                "budget": budget,
+            },
+            "overall_best_model": overall_best_name,
+            "overall_best_r2_score": model_report[overall_best_name],
+            "top_eligible_r2_score": top_score,
+            "r2_given_up": model_report[overall_best_name]
+            - model_report[best_model_name],
+            "eligible_models": sorted(eligible),
+            "within_tolerance": sorted(within_tolerance),
+            "candidates": {
+                name: {"r2_score": model_report[name], **model_costs[name]}
+                for name in model_report
+            },
+        }
+
+        return best_model_name, selection
+
+    def continue_training(self, model, new_train_array, train_array):
+        """Continue training a fitted model without a hyperparameter search.
+
+        Gradient Boosting, XGBoost and CatBoost append trees/rounds fitted on the
+        new rows and a random forest appends trees fitted on the full training
+        data. Linear Regression, Decision Tree and AdaBoost cannot be extended,
+        so they are refitted on the full training data with their tuned
+        hyperparameters.
+
+        Args:
+            model (object): Fitted model loaded from the artifacts.
+            new_train_array (numpy.ndarray): Newly ingested training rows.
+            train_array (numpy.ndarray): Full training data array.
+
+        Returns:
+            object: The updated model.
+        """
+        k = self.model_trainer_config.incremental_estimators
+        xnew, ynew = new_train_array[:, :-1], new_train_array[:, -1]
+        xtrain, ytrain = train_array[:, :-1], train_array[:, -1]
+
+        if isinstance(model, GradientBoostingRegressor):
+            model.set_params(warm_start=True, n_estimators=model.n_estimators + k)
+            model.fit(xnew, ynew)
+        elif isinstance(model, XGBRegressor):
+            booster = model.get_booster()
+            model.set_params(n_estimators=k)
+            model.fit(xnew, ynew, xgb_model=booster)
+        elif isinstance(model, CatBoostRegressor):
+            init_model = copy.deepcopy(model)
+            model.set_params(iterations=k)
+            model.fit(xnew, ynew, init_model=init_model)
+        elif isinstance(model, RandomForestRegressor):
+            model.set_params(warm_start=True, n_estimators=model.n_estimators + k)
+            model.fit(xtrain, ytrain)
+        else:
+            model.fit(xtrain, ytrain)
+
+        return model
+
+    def initiate_incremental_training(self, new_train_array, train_array, test_array):
+        """Update the selected model with newly ingested rows.
+
+        The model is scored before and after the update on the same test set,
+        which already includes the new test rows, so the gate measures the
+        update itself rather than the change of test set.
+
+        Args:
+            new_train_array (numpy.ndarray): Newly ingested training rows.
+            train_array (numpy.ndarray): Full training data array.
+            test_array (numpy.ndarray): Full test data array.
+
+        Raises:
+            CustomException: Raised for various exceptions.
+
+        Returns:
+            Optional[float]: R2 score of the updated model on the test dataset, or
+                None if it dropped too far and a full model search is required.
+        """
+        try:
+            config = self.model_trainer_config
+            xtest, ytest = test_array[:, :-1], test_array[:, -1]
+
+            logging.info("Loading selected model for incremental training")
+            manifest = load_json(file_path=config.manifest_file_path)
+            model_entry = manifest["model"]
+            bundle = load_object(file_path=config.trained_model_file_path)
+            model = bundle["model"]
+
+            # Score before continuing, which updates some models in place.
+            previous_r2 = r2_score(ytest, model.predict(xtest))
+
+            logging.info(f"Continuing training of {model_entry['name']}")
+            model = self.continue_training(model, new_train_array, train_array)
+
+            # Sum the drops since the last full training so repeated updates
+            # cannot each give up `max_r2_drop` and decline without bound.
+            r2_sc = r2_score(ytest, model.predict(xtest))
+            r2_drop = model_entry.get("incremental_r2_drop", 0.0) + max(
+                previous_r2 - r2_sc, 0.0
+            )
+            if r2_sc < config.min_r2_score or r2_drop > config.max_r2_drop:
+                logging.info(
+                    f"Incremental R2 {r2_sc:.4f} against {previous_r2:.4f} before "
+                    f"the update, {r2_drop:.4f} dropped since full training, "
+                    "full training required"
+                )
+                return None
+
+            save_object(
+                file_path=config.trained_model_file_path,
+                obj={"model": model, "preprocessor": bundle["preprocessor"]},
+            )
+
+            model_costs = evaluate_model_costs(
+                models={model_entry["name"]: model},
+                xtest=xtest,
+                n_repeats=config.latency_repeats,
+            )
+            model_entry.update(
+                {
+                    "r2_score": r2_sc,
+                    "incremental_r2_drop": r2_drop,
+                    **model_costs[model_entry["name"]],
+                    "last_incremental_training_at": datetime.now().isoformat(),
+                    "incremental_updates": model_entry.get("incremental_updates", 0)
+                    + 1,
+                }
+            )
+            update_json(
+                file_path=config.manifest_file_path, updates={"model": model_entry}
+            )
+
+            return r2_sc
+
+        except Exception as e:
+            raise CustomException(e, sys)
+
+    def train_best_model(self, xtrain, ytrain, xtest, ytest, min_r2_score=None):
+        """Search all candidate models for one target and select the one to serve.
+
+        Args:
+            xtrain (numpy.ndarray): Training input data.
+            ytrain (numpy.ndarray): Training target values.
+            xtest (numpy.ndarray): Test input data.
+            ytest (numpy.ndarray): Test target values.
+            min_r2_score (float, optional): R2 floor overriding the configured one.
+
+        Returns:
+            Tuple[str, object, dict, dict]: Name of the selected model, the fitted
+                model, the selection record and its serving cost.
+        """
+        model = {
+            "Random Forest": RandomForestRegressor(),
+            "Decision Tree": DecisionTreeRegressor(),
+            "Gradient Boosting": GradientBoostingRegressor(),
+            "Linear Regression": LinearRegression(),
+            "CatBoost": CatBoostRegressor(),
+            "AdaBoost": AdaBoostRegressor(),
+            "XGBoost": XGBRegressor(),
+        }
+
+        params = {
+            "Decision Tree": {
+                "criterion": [
+                    "squared_error",
+                    "friedman_mse",
+                    "absolute_error",
+                    "poisson",
+                ],
+                "splitter": ["best", "random"],
+                "max_features": ["sqrt", "log2"],
+            },
+            "Random Forest": {
+                "criterion": [
+                    "squared_error",
+                    "friedman_mse",
+                    "absolute_error",
+                    "poisson",
+                ],
+                "max_features": ["sqrt", "log2", None],
+                "n_estimators": [8, 16, 32, 64, 128, 256],
+            },
+            "Gradient Boosting": {
+                "loss": ["squared_error", "huber", "absolute_error", "quantile"],
+                "learning_rate": [0.1, 0.01, 0.05, 0.001],
+                "subsample": [0.6, 0.7, 0.75, 0.8, 0.85, 0.9],
+                "criterion": ["squared_error", "friedman_mse"],
+                "max_features": ["auto", "sqrt", "log2"],
+                "n_estimators": [8, 16, 32, 64, 128, 256],
+            },
+            "Linear Regression": {},
+            "XGBoost": {
+                "learning_rate": [0.1, 0.01, 0.05, 0.001],
+                "n_estimators": [8, 16, 32, 64, 128, 256],
+            },
+            "CatBoost": {
+                "depth": [6, 8, 10],
+                "learning_rate": [0.01, 0.05, 0.1],
+                "iterations": [30, 50, 100],
+            },
+            "AdaBoost": {
+                "learning_rate": [0.1, 0.01, 0.5, 0.001],
+                "loss": ["linear", "square", "exponential"],
+                "n_estimators": [8, 16, 32, 64, 128, 256],
+            },
+        }
+
+        model_report: dict = evaluate_models(
+            xtrain=xtrain,
+            xtest=xtest,
+            ytrain=ytrain,
+            ytest=ytest,
+            models=model,
+            params=params,
+        )
+        logging.info("Measuring serving latency and size of each model")
+        model_costs: dict = evaluate_model_costs(
+            models=model,
+            xtest=xtest,
+            n_repeats=self.model_trainer_config.latency_repeats,
+        )
+
+        logging.info("Finding the best model name with score initiated")
+        best_model_name, selection = self.select_best_model(
+            model_report=model_report,
+            model_costs=model_costs,
+            min_r2_score=min_r2_score,
+        )
+
+        logging.info(
+            f"Best model is {best_model_name}, "
+            f"giving up {selection['r2_given_up']:.4f} R2 for lower serving cost"
+        )
+
+        return (
+            best_model_name,
+            model[best_model_name],
+            selection,
+            model_costs[best_model_name],
+        )
 
-    def initiate_model_trainer(self, train_array, test_array):
+    def initiate_model_trainer(self, train_array, test_array, preprocessor):
         """Initialize the model training process.
 
+        The selected model is saved in one file together with the preprocessor
+        it was trained on, so a server reloading it never pairs mismatched ones.
+
         Args:
             train_array (numpy.ndarray): Training data array.
             test_array (numpy.ndarray): Test data array.
+            preprocessor (ColumnTransformer): Preprocessor fitted for the arrays.
 
         Raises:
             CustomException: Raised for various exceptions.
@@ -52,91 +386,107 @@ class ModelTrainer:
                 test_array[:, -1],
             )
 
-            model = {
-                "Random Forest": RandomForestRegressor(),
-                "Decision Tree": DecisionTreeRegressor(),
-                "Gradient Boosting": GradientBoostingRegressor(),
-                "Linear Regression": LinearRegression(),
-                "CatBoost": CatBoostRegressor(),
-                "AdaBoost": AdaBoostRegressor(),
-                "XGBoost": XGBRegressor(),
-            }
-
-            params = {
-                "Decision Tree": {
-                    "criterion": [
-                        "squared_error",
-                        "friedman_mse",
-                        "absolute_error",
-                        "poisson",
-                    ],
-                    "splitter": ["best", "random"],
-                    "max_features": ["sqrt", "log2"],
-                },
-                "Random Forest": {
-                    "criterion": [
-                        "squared_error",
-                        "friedman_mse",
-                        "absolute_error",
-                        "poisson",
-                    ],
-                    "max_features": ["sqrt", "log2", None],
-                    "n_estimators": [8, 16, 32, 64, 128, 256],
-                },
-                "Gradient Boosting": {
-                    "loss": ["squared_error", "huber", "absolute_error", "quantile"],
-                    "learning_rate": [0.1, 0.01, 0.05, 0.001],
-                    "subsample": [0.6, 0.7, 0.75, 0.8, 0.85, 0.9],
-                    "criterion": ["squared_error", "friedman_mse"],
-                    "max_features": ["auto", "sqrt", "log2"],
-                    "n_estimators": [8, 16, 32, 64, 128, 256],
-                },
-                "Linear Regression": {},
-                "XGBoost": {
-                    "learning_rate": [0.1, 0.01, 0.05, 0.001],
-                    "n_estimators": [8, 16, 32, 64, 128, 256],
-                },
-                "CatBoost": {
-                    "depth": [6, 8, 10],
-                    "learning_rate": [0.01, 0.05, 0.1],
-                    "iterations": [30, 50, 100],
-                },
-                "AdaBoost": {
-                    "learning_rate": [0.1, 0.01, 0.5, 0.001],
-                    "loss": ["linear", "square", "exponential"],
-                    "n_estimators": [8, 16, 32, 64, 128, 256],
-                },
-            }
-
-            model_report: dict = evaluate_models(
-                xtrain=xtrain,
-                xtest=xtest,
-                ytrain=ytrain,
-                ytest=ytest,
-                models=model,
-                params=params,
+            best_model_name, best_model, selection, model_cost = self.train_best_model(
+                xtrain=xtrain, ytrain=ytrain, xtest=xtest, ytest=ytest
             )
-            logging.info("Finding the best model name with score initiated")
-
-            best_model_score = max(sorted(model_report.values()))
-            if best_model_score < 0.6:
-                raise CustomException("Best model not found")
-
-            for key in model_report.keys():
-                if model_report[key] == max(sorted(model_report.values())):
-                    best_model = model[key]
-
-            logging.info("Best found model on both training and testing dataset")
 
             save_object(
                 file_path=self.model_trainer_config.trained_model_file_path,
-                obj=best_model,
+                obj={"model": best_model, "preprocessor": preprocessor},
             )
 
             predicted = best_model.predict(xtest)
             r2_sc = r2_score(ytest, predicted)
 
+            update_json(
+                file_path=self.model_trainer_config.manifest_file_path,
+                updates={
+                    self.model_trainer_config.manifest_model_key: {
+                        "name": best_model_name,
+                        "file_path": self.model_trainer_config.trained_model_file_path,
+                        "r2_score": r2_sc,
+                        "full_training_r2_score": r2_sc,
+                        **model_cost,
+                        "last_full_training_at": datetime.now().isoformat(),
+                        "incremental_updates": 0,
+                        "incremental_r2_drop": 0.0,
+                        "selection": selection,
+                    },
+                },
+            )
+
             return r2_sc
 
         except Exception as e:
             raise CustomException(e, sys)
+
+    def initiate_multi_target_trainer(
+        self, train_array, test_array, target_columns, preprocessor
+    ):
+        """Train one model per target on a shared feature matrix and bundle them.
+
+        Args:
+            train_array (numpy.ndarray): Training data array ending with one column per target.
+            test_array (numpy.ndarray): Test data array ending with one column per target.
+            target_columns (list): Names of the targets, in array column order.
+            preprocessor (ColumnTransformer): Preprocessor fitted for the shared features.
+
+        Raises:
+            CustomException: Raised for various exceptions.
+
+        Returns:
+            dict: R2 score of the selected model on the test dataset for each target.
+        """
+        try:
+            config = self.model_trainer_config
+            n_targets = len(target_columns)
+            xtrain, xtest = train_array[:, :-n_targets], test_array[:, :-n_targets]
+
+            models, targets, r2_scores = {}, {}, {}
+            for i, target in enumerate(target_columns):
+                logging.info(f"Training models for target {target}")
+                ytrain = train_array[:, i - n_targets]
+                ytest = test_array[:, i - n_targets]
+
+                best_model_name, best_model, selection, model_cost = (
+                    self.train_best_model(
+                        xtrain=xtrain,
+                        ytrain=ytrain,
+                        xtest=xtest,
+                        ytest=ytest,
+                        min_r2_score=config.multi_target_min_r2_score,
+                    )
+                )
+
+                models[target] = best_model
+                r2_scores[target] = r2_score(ytest, best_model.predict(xtest))
+                targets[target] = {
+                    "name": best_model_name,
+                    "r2_score": r2_scores[target],
+                    **model_cost,
+                    "selection": selection,
+                }
+
+            save_object(
+                file_path=config.multi_target_model_file_path,
+                obj={
+                    "target_columns": list(target_columns),
+                    "preprocessor": preprocessor,
+                    "models": models,
+                },
+            )
+            update_json(
+                file_path=config.manifest_file_path,
+                updates={
+                    "multi_target": {
+                        "file_path": config.multi_target_model_file_path,
+                        "trained_at": datetime.now().isoformat(),
+                        "targets": targets,
+                    }
+                },
+            )
+
+            return r2_scores
+
+        except Exception as e:
+            raise CustomException(e, sys)
@@ -1,15 +1,130 @@
 import os
 import sys
+import time
+from dataclasses import dataclass
 
 import pandas as pd
 
-from src.components.data_ingestion import DataIngestion
 from src.components.data_transformation import DataTransformation
+from src.components.model_distiller import prepare_student, student_predict
 from src.exception import CustomException
-from src.utils import load_object
+from src.utils import load_json, load_object
+
+
+@dataclass
+class PredictPipelineConfig:
+    model_path: str = os.path.join("artifacts", "model.pkl")
+    student_path: str = os.path.join("artifacts", "student.json")
+    train_data_path: str = os.path.join("artifacts", "train.csv")
+    multi_target_model_path: str = os.path.join(
+        "artifacts", "multi_target", "models.pkl"
+    )
+    # Refit the preprocessor on train.csv for bare models saved before it was
+    # bundled with them. Candidates must ship their own preprocessor instead.
+    fit_missing_preprocessor: bool = True
+    # "teacher" serves model.pkl, "student" serves the distilled coefficient table.
+    serving_model: str = os.getenv("SERVING_MODEL", "teacher")
 
 
 class PredictPipeline:
+    def __init__(self):
+        """
+        Initialize the PredictPipeline object. Artifacts are loaded on first use
+        and reloaded whenever they are replaced on disk, so a retrain takes
+        effect without restarting the server.
+        """
+        self.predict_pipeline_config = PredictPipelineConfig()
+        self.model = None
+        self.preprocessor = None
+        self.student = None
+        self.multi_target_bundle = None
+        self.artifact_mtimes = {}
+
+    def reload_if_changed(self, key, loader, *paths):
+        """Run a loader if its artifacts changed on disk since the last load.
+
+        Artifacts are published with `os.replace`, so a new inode or
+        modification time identifies a complete new file.
+
+        Args:
+            key (str): Name of the loaded artifact group.
+            loader (Callable): Method loading the artifact group.
+            *paths (str): Files the artifact group is loaded from.
+        """
+        mtimes = tuple(
+            (os.stat(path).st_ino, os.stat(path).st_mtime_ns)
+            if os.path.exists(path)
+            else None
+            for path in paths
+        )
+        if self.artifact_mtimes.get(key) != mtimes:
+            loader()
+            self.artifact_mtimes[key] = mtimes
+
+    def load_student(self):
+        """Load the distilled student and build its lookup tables."""
+        self.student = prepare_student(
+            load_json(file_path=self.predict_pipeline_config.student_path)
+        )
+
+    def load_multi_target_bundle(self):
+        """Load the multi-target bundle of preprocessor and per-target models."""
+        self.multi_target_bundle = load_object(
+            file_path=self.predict_pipeline_config.multi_target_model_path
+        )
+
+    def load_teacher(self):
+        """Load the trained model and its fitted preprocessor from one bundle.
+
+        Bare models saved before the preprocessor was bundled with them fall
+        back to fitting the preprocessor once on the training split, if allowed.
+
+        Raises:
+            ValueError: If the model has no preprocessor and may not be refitted.
+        """
+        config = self.predict_pipeline_config
+        bundle = load_object(file_path=config.model_path)
+        if isinstance(bundle, dict) and "model" in bundle:
+            model, preprocessor = bundle["model"], bundle["preprocessor"]
+        elif not config.fit_missing_preprocessor:
+            raise ValueError(f"Model {config.model_path} has no bundled preprocessor")
+        else:
+            model = bundle
+            train_df = pd.read_csv(config.train_data_path)
+            preprocessor = DataTransformation().get_data_transformer_object()
+            preprocessor.fit(train_df)
+        self.model = model
+        self.preprocessor = preprocessor
+
+    def reload_serving_model(self):
+        """Reload the configured serving model if its artifact changed on disk.
+
+        Raises:
+            ValueError: If the configured serving model is unknown.
+        """
+        config = self.predict_pipeline_config
+        if config.serving_model == "student":
+            self.reload_if_changed("student", self.load_student, config.student_path)
+        elif config.serving_model == "teacher":
+            self.reload_if_changed("teacher", self.load_teacher, config.model_path)
+        else:
+            raise ValueError(f"Unknown serving model {config.serving_model}")
+
+    def predict_loaded(self, features):
+        """Predict with the serving model as currently loaded.
+
+        Args:
+            features (pd.DataFrame): Input features for prediction.
+
+        Returns:
+            np.ndarray: Predicted target variable.
+        """
+        if self.predict_pipeline_config.serving_model == "student":
+            return student_predict(self.student, features)
+
+        data_scaled = self.preprocessor.transform(features)
+        return self.model.predict(data_scaled)
+
     def predict(self, features):
         """Predict the target variable using a pre-trained model.
 
@@ -23,18 +138,84 @@ class PredictPipeline:
             np.ndarray: Predicted target variable.
         """
         try:
-            model_path = os.path.join("artifacts", "model.pkl")
-            model = load_object(file_path=model_path)
-            data_ingestion_instance = DataIngestion()
-            train_path, _ = data_ingestion_instance.initiate_data_ingestion()
-            train_df = pd.read_csv(train_path)
-            data_trans_instance = DataTransformation()
-            preprocessor = data_trans_instance.get_data_transformer_object()
-            train_arr = preprocessor.fit_transform(train_df)
-            data_scaled = preprocessor.transform(features)
-            preds = model.predict(data_scaled)
-
-            return preds
+            self.reload_serving_model()
+            return self.predict_loaded(features)
+
+        except Exception as e:
+            raise CustomException(e, sys)
+
+    def predict_with_latency(self, features):
+        """Predict and time only the transform and model call.
+
+        Reloading and its file checks happen before the timer starts, so the
+        latency is comparable between pipelines.
+
+        Args:
+            features (pd.DataFrame): Input features for prediction.
+
+        Raises:
+            CustomException: An exception raised during the prediction process.
+
+        Returns:
+            Tuple[np.ndarray, float]: Predicted target variable and latency in ms.
+        """
+        try:
+            self.reload_serving_model()
+            start = time.perf_counter()
+            preds = self.predict_loaded(features)
+            return preds, (time.perf_counter() - start) * 1000
+
+        except Exception as e:
+            raise CustomException(e, sys)
+
+    def get_multi_target_feature_names(self):
+        """Get the input columns the multi-target bundle was trained on.
+
+        Raises:
+            CustomException: An exception raised while loading the bundle.
+
+        Returns:
+            list: Input feature column names.
+        """
+        try:
+            self.reload_if_changed(
+                "multi_target",
+                self.load_multi_target_bundle,
+                self.predict_pipeline_config.multi_target_model_path,
+            )
+            return list(self.multi_target_bundle["preprocessor"].feature_names_in_)
+
+        except Exception as e:
+            raise CustomException(e, sys)
+
+    def predict_all(self, features):
+        """Predict every target of the multi-target bundle in one pass.
+
+        The features are encoded once and the same matrix is fed to each
+        per-target model.
+
+        Args:
+            features (pd.DataFrame): Input features for prediction.
+
+        Raises:
+            CustomException: An exception raised during the prediction process.
+
+        Returns:
+            dict: Predicted values for each target column.
+        """
+        try:
+            self.reload_if_changed(
+                "multi_target",
+                self.load_multi_target_bundle,
+                self.predict_pipeline_config.multi_target_model_path,
+            )
+            bundle = self.multi_target_bundle
+
+            data_scaled = bundle["preprocessor"].transform(features)
+            return {
+                target: bundle["models"][target].predict(data_scaled)
+                for target in bundle["target_columns"]
+            }
 
         except Exception as e:
             raise CustomException(e, sys)
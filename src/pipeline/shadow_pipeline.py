@@ -0,0 +1,151 @@
+import os
+import random
+import sys
+import threading
+from collections import deque
+from dataclasses import dataclass
+
+import numpy as np
+
+from src.exception import CustomException
+from src.logger import logging
+from src.pipeline.predict_pipeline import PredictPipeline, PredictPipelineConfig
+
+
+@dataclass
+class ShadowPipelineConfig:
+    # Written by TrainPipeline with TrainPipelineConfig.save_as_candidate.
+    # Bundle of the candidate model and its preprocessor.
+    candidate_model_path: str = os.path.join("artifacts", "candidate", "model.pkl")
+    # Fraction of /predictdata requests mirrored to the candidate model.
+    shadow_fraction: float = float(os.getenv("SHADOW_FRACTION", "0.0"))
+    buffer_size: int = 1000
+    # Absolute prediction delta under which primary and candidate agree.
+    agreement_tolerance: float = 1.0
+
+
+class ShadowPipeline:
+    def __init__(self, shadow_pipeline_config=None):
+        """
+        Initialize the ShadowPipeline object. The candidate is loaded on first use
+        and reloaded whenever its bundle is replaced.
+        """
+        config = self.shadow_pipeline_config = (
+            shadow_pipeline_config or ShadowPipelineConfig()
+        )
+        self.candidate = PredictPipeline()
+        self.candidate.predict_pipeline_config = PredictPipelineConfig(
+            model_path=config.candidate_model_path,
+            serving_model="teacher",
+            fit_missing_preprocessor=False,
+        )
+        self.records = deque(maxlen=config.buffer_size)
+        self.last_error = None
+        self.lock = threading.Lock()
+
+    def is_enabled(self):
+        """Check whether a candidate model is available for shadowing.
+
+        Returns:
+            bool: True if mirroring is configured and the candidate model exists.
+        """
+        config = self.shadow_pipeline_config
+        return config.shadow_fraction > 0 and os.path.exists(
+            config.candidate_model_path
+        )
+
+    def should_mirror(self):
+        """Decide whether the current request is mirrored to the candidate.
+
+        Returns:
+            bool: True if the request should be shadowed.
+        """
+        return (
+            self.is_enabled()
+            and random.random() < self.shadow_pipeline_config.shadow_fraction
+        )
+
+    def evaluate(
+        self, features, primary_prediction, primary_latency_ms, primary_serving_model
+    ):
+        """Score a mirrored request with the candidate and record the outcome.
+
+        Meant to run as a background task once the primary response is sent, so
+        failures are logged and reported by `summary` rather than raised. Both
+        latencies cover only the transform and model call, as measured by
+        `PredictPipeline.predict_with_latency`.
+
+        Args:
+            features (pd.DataFrame): Input features of the mirrored request.
+            primary_prediction (float): Prediction served by the primary model.
+            primary_latency_ms (float): Latency of the primary prediction.
+            primary_serving_model (str): Serving model of the primary, "teacher"
+                or "student", which the deltas are measured against.
+        """
+        try:
+            with self.lock:
+                previous_mtimes = self.candidate.artifact_mtimes.get("teacher")
+                candidate_predictions, candidate_latency_ms = (
+                    self.candidate.predict_with_latency(features)
+                )
+
+                # A new candidate or primary serving model starts a fresh buffer.
+                if self.candidate.artifact_mtimes["teacher"] != previous_mtimes or (
+                    self.records
+                    and self.records[-1]["primary_serving_model"]
+                    != primary_serving_model
+                ):
+                    self.records.clear()
+                    self.last_error = None
+
+                self.records.append(
+                    {
+                        "delta": float(candidate_predictions[0])
+                        - float(primary_prediction),
+                        "primary_serving_model": primary_serving_model,
+                        "primary_latency_ms": primary_latency_ms,
+                        "candidate_latency_ms": candidate_latency_ms,
+                    }
+                )
+
+        except Exception as e:
+            error = CustomException(e, sys)
+            self.last_error = str(error)
+            logging.error(f"Shadow evaluation failed: {error}")
+
+    def summary(self):
+        """Summarize agreement and latency of the candidate over the ring buffer.
+
+        Returns:
+            dict: Sample count, prediction delta and latency statistics.
+        """
+        config = self.shadow_pipeline_config
+        with self.lock:
+            records = list(self.records)
+
+        summary = {
+            "enabled": self.is_enabled(),
+            "candidate_model_path": config.candidate_model_path,
+            "shadow_fraction": config.shadow_fraction,
+            "buffer_size": config.buffer_size,
+            "samples": len(records),
+            "last_error": self.last_error,
+        }
+        if not records:
+            return summary
+
+        summary["primary_serving_model"] = records[-1]["primary_serving_model"]
+        deltas = np.array([record["delta"] for record in records])
+        abs_deltas = np.abs(deltas)
+        summary["mean_delta"] = float(deltas.mean())
+        summary["mean_abs_delta"] = float(abs_deltas.mean())
+        summary["max_abs_delta"] = float(abs_deltas.max())
+        summary["agreement_rate"] = float(
+            (abs_deltas <= config.agreement_tolerance).mean()
+        )
+        for key in ("primary_latency_ms", "candidate_latency_ms"):
+            latencies = np.array([record[key] for record in records])
+            for q in (50, 95, 99):
+                summary[f"{key}_p{q}"] = float(np.percentile(latencies, q))
+
+        return summary
@@ -0,0 +1,294 @@
+import os
+import sys
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import List
+
+from src.components.data_ingestion import DataIngestion, DataIngestionConfig
+from src.components.data_transformation import DataTransformation
+from src.components.model_distiller import ModelDistiller
+from src.components.model_trainer import ModelTrainer, ModelTrainerConfig
+from src.exception import CustomException
+from src.logger import logging
+from src.utils import load_json, load_object
+
+
+@dataclass
+class TrainPipelineConfig:
+    distill_student: bool = False
+    # Incremental mode trains on rows appended since the last run and only
+    # falls back to a full model search on drift or when the cadence is due.
+    incremental: bool = False
+    full_training_interval_days: int = 7
+    # Drift of a batch of new rows against the frozen preprocessor: its mean
+    # moving more than `max_feature_drift` standard deviations (and beyond
+    # sampling noise), or its standard deviation changing by a larger factor.
+    max_feature_drift: float = 0.25
+    drift_z_threshold: float = 3.0
+    max_std_ratio: float = 1.5
+    min_rows_for_std_drift: int = 10
+    manifest_file_path: str = os.path.join("artifacts", "manifest.json")
+    # Multi-target mode trains one bundle predicting every target column from a
+    # single ingestion and preprocessor fit; it always runs a full search on its
+    # own split so the served single-target splits and watermark are untouched,
+    # and writes its splits and models.pkl under `multi_target_artifacts_dir`.
+    multi_target: bool = False
+    multi_target_columns: List[str] = field(
+        default_factory=lambda: ["math_score", "reading_score", "writing_score"]
+    )
+    multi_target_artifacts_dir: str = os.path.join("artifacts", "multi_target")
+    # Candidate mode runs a full search on its own split and saves the model and
+    # preprocessor bundle where ShadowPipeline loads it, leaving model.pkl untouched.
+    save_as_candidate: bool = False
+    candidate_artifacts_dir: str = os.path.join("artifacts", "candidate")
+
+
+class TrainPipeline:
+    def __init__(self):
+        """
+        Initialize the TrainPipeline object.
+        """
+        self.train_pipeline_config = TrainPipelineConfig()
+
+    def needs_full_training(self):
+        """Check whether the scheduled cadence or missing state requires a full run.
+
+        Returns:
+            bool: True if a full model search is required.
+        """
+        config = self.train_pipeline_config
+        if not os.path.exists(config.manifest_file_path):
+            return True
+
+        manifest = load_json(file_path=config.manifest_file_path)
+        if "ingestion" not in manifest or "model" not in manifest:
+            return True
+
+        last_full_training_at = manifest["model"].get("last_full_training_at")
+        if last_full_training_at is None:
+            return True
+        if "full_training_r2_score" not in manifest["model"]:
+            return True
+
+        return datetime.now() - datetime.fromisoformat(
+            last_full_training_at
+        ) >= timedelta(days=config.full_training_interval_days)
+
+    def get_isolated_ingestion(self, artifacts_dir):
+        """Get a DataIngestion writing its own splits without moving the watermark.
+
+        Args:
+            artifacts_dir (str): Directory the raw, train and test data are written to.
+
+        Returns:
+            DataIngestion: Ingestion isolated from the served model's splits.
+        """
+        return DataIngestion(
+            DataIngestionConfig(
+                train_data_path=os.path.join(artifacts_dir, "train.csv"),
+                test_data_path=os.path.join(artifacts_dir, "test.csv"),
+                raw_data_path=os.path.join(artifacts_dir, "raw.csv"),
+                train_delta_path=os.path.join(artifacts_dir, "train_delta.csv"),
+                test_delta_path=os.path.join(artifacts_dir, "test_delta.csv"),
+                track_watermark=False,
+            )
+        )
+
+    def run_full(self):
+        """Run ingestion, transformation and the full model search.
+
+        Returns:
+            Tuple[dict, str, str]: Training result, train and test paths.
+        """
+        if self.train_pipeline_config.save_as_candidate:
+            artifacts_dir = self.train_pipeline_config.candidate_artifacts_dir
+            data_ingestion = self.get_isolated_ingestion(artifacts_dir)
+            model_trainer = ModelTrainer(
+                ModelTrainerConfig(
+                    trained_model_file_path=os.path.join(artifacts_dir, "model.pkl"),
+                    manifest_model_key="candidate",
+                )
+            )
+        else:
+            data_ingestion = DataIngestion()
+            model_trainer = ModelTrainer()
+
+        train_path, test_path = data_ingestion.initiate_data_ingestion()
+
+        (
+            train_array,
+            test_array,
+            preprocessor,
+        ) = DataTransformation().initiate_data_transformation(train_path, test_path)
+
+        r2_sc = model_trainer.initiate_model_trainer(
+            train_array=train_array, test_array=test_array, preprocessor=preprocessor
+        )
+
+        mode = "candidate" if self.train_pipeline_config.save_as_candidate else "full"
+        result = {"mode": mode, "r2_score": r2_sc}
+        return result, train_path, test_path
+
+    def is_drifted(self, drift):
+        """Check a drift report of `DataTransformation.measure_drift`.
+
+        Args:
+            drift (dict): Drift report of the new training rows.
+
+        Returns:
+            bool: True if the new rows require a full run.
+        """
+        config = self.train_pipeline_config
+        mean_drifted = (
+            drift["mean_shift"] > config.max_feature_drift
+            and drift["mean_shift_z"] > config.drift_z_threshold
+        )
+        std_drifted = (
+            drift["rows"] >= config.min_rows_for_std_drift
+            and drift["std_ratio"] > config.max_std_ratio
+        )
+        return mean_drifted or std_drifted
+
+    def run_incremental(self):
+        """Ingest appended rows and continue training the selected model.
+
+        The new rows are only appended to the splits, and the watermark moved,
+        once the updated model has been saved; a failed or rejected update leaves
+        them to be ingested again.
+
+        Returns:
+            Optional[Tuple[dict, str, str]]: Training result, train and test
+                paths, or None if drift requires a full run.
+        """
+        data_ingestion = DataIngestion()
+        ingested = data_ingestion.initiate_incremental_ingestion()
+        if ingested is None:
+            return {"mode": "incremental", "new_train_rows": 0}, None, None
+        train_delta_path, test_delta_path, rows_ingested = ingested
+        train_path = data_ingestion.ingestion_config.train_data_path
+        test_path = data_ingestion.ingestion_config.test_data_path
+
+        bundle = load_object(file_path=ModelTrainerConfig.trained_model_file_path)
+        if not isinstance(bundle, dict):
+            logging.info("Model saved without its preprocessor, full training required")
+            return None
+        (
+            new_train_array,
+            train_array,
+            test_array,
+            drift,
+        ) = DataTransformation().initiate_incremental_transformation(
+            bundle["preprocessor"],
+            train_delta_path,
+            test_delta_path,
+            train_path,
+            test_path,
+        )
+        if self.is_drifted(drift):
+            logging.info(f"Feature drift {drift} exceeds the allowed maximum")
+            return None
+
+        r2_sc = ModelTrainer().initiate_incremental_training(
+            new_train_array=new_train_array,
+            train_array=train_array,
+            test_array=test_array,
+        )
+        if r2_sc is None:
+            return None
+
+        data_ingestion.commit_incremental_ingestion(rows_ingested)
+
+        result = {
+            "mode": "incremental",
+            "new_train_rows": len(new_train_array),
+            "feature_drift": drift,
+            "r2_score": r2_sc,
+        }
+        return result, train_path, test_path
+
+    def run_multi_target(self):
+        """Run one ingestion and transformation, then train a model per target.
+
+        Returns:
+            dict: R2 score of the selected model for each target.
+        """
+        target_columns = self.train_pipeline_config.multi_target_columns
+        artifacts_dir = self.train_pipeline_config.multi_target_artifacts_dir
+        data_ingestion = self.get_isolated_ingestion(artifacts_dir)
+        train_path, test_path = data_ingestion.initiate_data_ingestion()
+
+        (
+            train_array,
+            test_array,
+            preprocessor,
+        ) = DataTransformation().initiate_data_transformation(
+            train_path, test_path, target_columns=target_columns
+        )
+
+        model_trainer = ModelTrainer(
+            ModelTrainerConfig(
+                multi_target_model_file_path=os.path.join(artifacts_dir, "models.pkl")
+            )
+        )
+        r2_scores = model_trainer.initiate_multi_target_trainer(
+            train_array=train_array,
+            test_array=test_array,
+            target_columns=target_columns,
+            preprocessor=preprocessor,
+        )
+
+        return {"mode": "multi_target", "r2_scores": r2_scores}
+
+    def run(self):
+        """Run training, incrementally when configured and possible, then distillation.
+
+        Raises:
+            CustomException: An exception raised during the training process.
+
+        Returns:
+            dict: R2 score of the served model and, if distilled, the student fidelity.
+        """
+        try:
+            if self.train_pipeline_config.multi_target:
+                return self.run_multi_target()
+
+            outcome = None
+            if (
+                self.train_pipeline_config.incremental
+                and not self.train_pipeline_config.save_as_candidate
+            ):
+                if self.needs_full_training():
+                    logging.info("Scheduled or initial full training required")
+                else:
+                    outcome = self.run_incremental()
+                    if outcome is None:
+                        logging.info("Incremental update not applied")
+
+            if outcome is None:
+                outcome = self.run_full()
+            result, train_path, test_path = outcome
+            if result.get("new_train_rows") == 0:
+                return result
+
+            if (
+                self.train_pipeline_config.distill_student
+                and not self.train_pipeline_config.save_as_candidate
+            ):
+                logging.info("Distilling the selected model into a student")
+                model_distiller = ModelDistiller()
+                result["student_fidelity"] = (
+                    model_distiller.initiate_model_distillation(
+                        train_path=train_path,
+                        test_path=test_path,
+                        model_path=ModelTrainerConfig.trained_model_file_path,
+                    )
+                )
+
+            return result
+
+        except Exception as e:
+            raise CustomException(e, sys)
+
+
+if __name__ == "__main__":
+    print(TrainPipeline().run())
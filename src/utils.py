@@ -1,7 +1,11 @@
+import json
 import os
 import sys
+import tempfile
+import time
 
 import dill
+import numpy as np
 from sklearn.metrics import r2_score
 from sklearn.model_selection import GridSearchCV, train_test_split
 from tqdm import tqdm
@@ -25,6 +29,31 @@ def split_data(df):
         raise CustomException(e, sys)
 
 
+def replace_file(file_path, write, mode="wb"):
+    """Write a file through a temporary file moved into place atomically.
+
+    Readers polling the file see either the previous or the new content, never
+    a partially written one.
+
+    Args:
+        file_path (str): The file path to write.
+        write (Callable): Function writing the content to an open file object.
+        mode (str, optional): Mode the temporary file is opened with. Defaults to "wb".
+    """
+    dir_path = os.path.dirname(file_path)
+    os.makedirs(dir_path or ".", exist_ok=True)
+    with tempfile.NamedTemporaryFile(
+        mode, dir=dir_path or ".", suffix=".tmp", delete=False
+    ) as file_obj:
+        try:
+            write(file_obj)
+        except BaseException:
+            file_obj.close()
+            os.remove(file_obj.name)
+            raise
+    os.replace(file_obj.name, file_path)
+
+
 def save_object(file_path, obj):
     """Save a Python object to a file using dill serialization.
 
@@ -36,10 +65,7 @@ def save_object(file_path, obj):
         CustomException: If an error occurs during the saving process.
     """
     try:
-        dir_path = os.path.dirname(file_path)
-        os.makedirs(dir_path, exist_ok=True)
-        with open(file_path, "wb") as file_obj:
-            dill.dump(obj, file_obj)
+        replace_file(file_path, lambda file_obj: dill.dump(obj, file_obj))
     except Exception as e:
         raise CustomException(e, sys)
 
@@ -87,6 +113,110 @@ def evaluate_models(xtrain, xtest, ytrain, ytest, models, params):
         raise CustomException(e, sys)
 
 
+def evaluate_model_costs(models, xtest, n_repeats=20):
+    """Measure the serving cost of fitted machine learning models.
+
+    Args:
+        models (dict): Dictionary of fitted machine learning models.
+        xtest (array-like): Testing input data used as the batch workload.
+        n_repeats (int, optional): Number of timed predict calls per measurement. Defaults to 20.
+
+    Raises:
+        CustomException: If an error occurs during the measurement process.
+
+    Returns:
+        dict: A dictionary containing the median single-row latency (ms), the median
+            batch latency (ms) and the serialized size (KB) for each model.
+    """
+    try:
+        costs = {}
+        single_row = xtest[:1]
+
+        for model_name, model in tqdm(models.items(), desc="Model Cost Evaluation"):
+            # Warm up once so lazy initialisation is not charged to the first timing.
+            model.predict(single_row)
+
+            single_timings = []
+            for _ in range(n_repeats):
+                start = time.perf_counter()
+                model.predict(single_row)
+                single_timings.append(time.perf_counter() - start)
+
+            batch_timings = []
+            for _ in range(n_repeats):
+                start = time.perf_counter()
+                model.predict(xtest)
+                batch_timings.append(time.perf_counter() - start)
+
+            costs[model_name] = {
+                "single_row_latency_ms": float(np.median(single_timings) * 1000),
+                "batch_latency_ms": float(np.median(batch_timings) * 1000),
+                "batch_size": int(len(xtest)),
+                "model_size_kb": len(dill.dumps(model)) / 1024,
+            }
+
+        return costs
+
+    except Exception as e:
+        raise CustomException(e, sys)
+
+
+def save_json(file_path, obj):
+    """Save a JSON serializable object to a file.
+
+    Args:
+        file_path (str): The file path where the object will be saved.
+        obj (dict): The object to be saved.
+
+    Raises:
+        CustomException: If an error occurs during the saving process.
+    """
+    try:
+        replace_file(
+            file_path, lambda file_obj: json.dump(obj, file_obj, indent=4), mode="w"
+        )
+    except Exception as e:
+        raise CustomException(e, sys)
+
+
+def load_json(file_path):
+    """Load a JSON object from a file.
+
+    Args:
+        file_path (str): The path to the JSON file.
+
+    Raises:
+        CustomException: If an error occurs during the loading process.
+
+    Returns:
+        dict: The deserialized object.
+    """
+    try:
+        with open(file_path) as file_obj:
+            return json.load(file_obj)
+
+    except Exception as e:
+        raise CustomException(e, sys)
+
+
+def update_json(file_path, updates):
+    """Merge top-level sections into a JSON file, creating it if needed.
+
+    Args:
+        file_path (str): The path to the JSON file.
+        updates (dict): Sections to add or replace.
+
+    Raises:
+        CustomException: If an error occurs during the update process.
+    """
+    try:
+        obj = load_json(file_path) if os.path.exists(file_path) else {}
+        obj.update(updates)
+        save_json(file_path, obj)
+    except Exception as e:
+        raise CustomException(e, sys)
+
+
 def load_object(file_path):
     """Load a serialized object from a file.
 
@@ -0,0 +1,240 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.ensemble import GradientBoostingRegressor, RandomForestRegressor
+from sklearn.linear_model import LinearRegression
+from xgboost import XGBRegressor
+
+from src.components.data_ingestion import DataIngestion, DataIngestionConfig
+from src.components.data_transformation import DataTransformation
+from src.components.model_trainer import ModelTrainer, ModelTrainerConfig
+from src.pipeline.train_pipeline import TrainPipeline
+from src.utils import load_json, load_object, save_json, save_object, update_json
+
+STUD_CSV = os.path.join(os.path.dirname(__file__), "..", "notebook", "data", "stud.csv")
+
+
+@pytest.fixture
+def stud_df():
+    return pd.read_csv(STUD_CSV)
+
+
+@pytest.fixture
+def ingestion_config(tmp_path):
+    return DataIngestionConfig(
+        train_data_path=str(tmp_path / "train.csv"),
+        test_data_path=str(tmp_path / "test.csv"),
+        raw_data_path=str(tmp_path / "raw.csv"),
+        train_delta_path=str(tmp_path / "train_delta.csv"),
+        test_delta_path=str(tmp_path / "test_delta.csv"),
+        source_data_path=str(tmp_path / "stud.csv"),
+        manifest_file_path=str(tmp_path / "manifest.json"),
+    )
+
+
+def test_incremental_ingestion_watermark_round_trip(stud_df, ingestion_config):
+    stud_df.iloc[:100].to_csv(ingestion_config.source_data_path, index=False)
+    data_ingestion = DataIngestion(ingestion_config)
+    data_ingestion.initiate_data_ingestion()
+    manifest = load_json(ingestion_config.manifest_file_path)
+    assert manifest["ingestion"]["rows_ingested"] == 100
+
+    stud_df.iloc[:120].to_csv(ingestion_config.source_data_path, index=False)
+    train_delta_path, test_delta_path, rows_ingested = (
+        data_ingestion.initiate_incremental_ingestion()
+    )
+    columns = list(stud_df.columns)
+    new_df = pd.concat([pd.read_csv(train_delta_path), pd.read_csv(test_delta_path)])
+    assert rows_ingested == 120
+    pd.testing.assert_frame_equal(
+        new_df[columns].sort_values(columns).reset_index(drop=True),
+        stud_df.iloc[100:120].sort_values(columns).reset_index(drop=True),
+    )
+
+    # Until committed, the watermark and splits are untouched and the same rows
+    # are ingested again.
+    assert load_json(ingestion_config.manifest_file_path)["ingestion"] == {
+        "rows_ingested": 100
+    }
+    assert data_ingestion.initiate_incremental_ingestion()[2] == 120
+    assert len(pd.read_csv(ingestion_config.train_data_path)) + len(
+        pd.read_csv(ingestion_config.test_data_path)
+    ) == 100
+
+    data_ingestion.commit_incremental_ingestion(rows_ingested)
+    assert load_json(ingestion_config.manifest_file_path)["ingestion"] == {
+        "rows_ingested": 120
+    }
+    assert len(pd.read_csv(ingestion_config.train_data_path)) + len(
+        pd.read_csv(ingestion_config.test_data_path)
+    ) == 120
+    assert len(pd.read_csv(ingestion_config.raw_data_path)) == 120
+    assert data_ingestion.initiate_incremental_ingestion() is None
+
+
+@pytest.fixture
+def regression_arrays():
+    rng = np.random.default_rng(0)
+    x = rng.normal(size=(200, 3))
+    y = x @ np.array([1.0, -2.0, 0.5]) + rng.normal(scale=0.1, size=200)
+    array = np.c_[x, y]
+    return array[150:], array[:150]
+
+
+def test_continue_training_gradient_boosting_appends_stages(regression_arrays):
+    new_train_array, train_array = regression_arrays
+    model_trainer = ModelTrainer()
+    model = GradientBoostingRegressor(n_estimators=10).fit(
+        train_array[:, :-1], train_array[:, -1]
+    )
+
+    model = model_trainer.continue_training(model, new_train_array, train_array)
+
+    k = model_trainer.model_trainer_config.incremental_estimators
+    assert len(model.estimators_) == 10 + k
+
+
+def test_continue_training_random_forest_appends_trees(regression_arrays):
+    new_train_array, train_array = regression_arrays
+    model_trainer = ModelTrainer()
+    model = RandomForestRegressor(n_estimators=8).fit(
+        train_array[:, :-1], train_array[:, -1]
+    )
+    first_trees = list(model.estimators_)
+
+    model = model_trainer.continue_training(model, new_train_array, train_array)
+
+    k = model_trainer.model_trainer_config.incremental_estimators
+    assert len(model.estimators_) == 8 + k
+    assert model.estimators_[:8] == first_trees
+
+
+def test_continue_training_xgboost_appends_rounds(regression_arrays):
+    new_train_array, train_array = regression_arrays
+    model_trainer = ModelTrainer()
+    model = XGBRegressor(n_estimators=10).fit(train_array[:, :-1], train_array[:, -1])
+
+    model = model_trainer.continue_training(model, new_train_array, train_array)
+
+    k = model_trainer.model_trainer_config.incremental_estimators
+    assert model.get_booster().num_boosted_rounds() == 10 + k
+
+
+@pytest.fixture
+def incremental_model_trainer(tmp_path, regression_arrays):
+    _, train_array = regression_arrays
+    config = ModelTrainerConfig(
+        trained_model_file_path=str(tmp_path / "model.pkl"),
+        manifest_file_path=str(tmp_path / "manifest.json"),
+        latency_repeats=1,
+    )
+    model = LinearRegression().fit(train_array[:, :-1], train_array[:, -1])
+    save_object(config.trained_model_file_path, {"model": model, "preprocessor": None})
+    save_json(
+        config.manifest_file_path,
+        {"model": {"name": "Linear Regression", "incremental_r2_drop": 0.0}},
+    )
+    return ModelTrainer(config)
+
+
+def test_incremental_training_gates_on_pre_update_score(
+    incremental_model_trainer, regression_arrays
+):
+    new_train_array, train_array = regression_arrays
+    config = incremental_model_trainer.model_trainer_config
+    # An enlarged test set the current model already scores far below its full
+    # training R2 on; only the change made by the update itself is gated.
+    test_array = new_train_array.copy()
+    test_array[:, -1] += np.random.default_rng(1).normal(scale=1.0, size=50)
+
+    r2_sc = incremental_model_trainer.initiate_incremental_training(
+        new_train_array, np.r_[train_array, new_train_array], test_array
+    )
+
+    assert r2_sc is not None and r2_sc < 0.9
+    model_entry = load_json(config.manifest_file_path)["model"]
+    assert model_entry["incremental_updates"] == 1
+    assert 0 <= model_entry["incremental_r2_drop"] <= config.max_r2_drop
+
+    poisoned_array = new_train_array.copy()
+    poisoned_array[:, -1] = -poisoned_array[:, -1]
+    model_before = load_object(config.trained_model_file_path)["model"]
+
+    r2_sc = incremental_model_trainer.initiate_incremental_training(
+        poisoned_array, np.r_[train_array, poisoned_array], test_array
+    )
+
+    assert r2_sc is None
+    model_after = load_object(config.trained_model_file_path)["model"]
+    np.testing.assert_array_equal(model_after.coef_, model_before.coef_)
+
+
+def test_incremental_training_limits_cumulative_r2_drop(
+    incremental_model_trainer, regression_arrays
+):
+    new_train_array, train_array = regression_arrays
+    config = incremental_model_trainer.model_trainer_config
+    noisy_array = new_train_array.copy()
+    noisy_array[:, -1] += np.random.default_rng(2).normal(scale=1.0, size=50)
+    full_train_array = np.r_[train_array, noisy_array]
+    # Measure the drop this update gives up on its own.
+    r2_sc = incremental_model_trainer.initiate_incremental_training(
+        noisy_array, full_train_array, new_train_array
+    )
+    assert r2_sc is not None
+    drop = load_json(config.manifest_file_path)["model"]["incremental_r2_drop"]
+    assert 0 < drop <= config.max_r2_drop
+
+    update_json(
+        config.manifest_file_path,
+        {
+            "model": {
+                "name": "Linear Regression",
+                "incremental_r2_drop": config.max_r2_drop - drop / 2,
+            }
+        },
+    )
+    save_object(
+        config.trained_model_file_path,
+        {
+            "model": LinearRegression().fit(train_array[:, :-1], train_array[:, -1]),
+            "preprocessor": None,
+        },
+    )
+
+    assert (
+        incremental_model_trainer.initiate_incremental_training(
+            noisy_array, full_train_array, new_train_array
+        )
+        is None
+    )
+
+
+def test_measure_drift_flags_shifted_batch_only(stud_df):
+    data_transformation = DataTransformation()
+    preprocessor = data_transformation.get_data_transformer_object()
+    preprocessor.fit(stud_df)
+
+    same = data_transformation.measure_drift(preprocessor, stud_df.iloc[:20])
+    shifted_df = stud_df.iloc[:20].copy()
+    shifted_df["reading_score"] += 15
+    shifted = data_transformation.measure_drift(preprocessor, shifted_df)
+
+    assert same["rows"] == 20
+    assert shifted["mean_shift"] > 0.8
+    assert not TrainPipeline().is_drifted(same)
+    assert TrainPipeline().is_drifted(shifted)
+
+
+def test_update_json_merges_sections(tmp_path):
+    manifest_path = str(tmp_path / "manifest.json")
+    save_json(manifest_path, {"ingestion": {"rows_ingested": 10}, "model": {}})
+
+    update_json(manifest_path, {"model": {"name": "Linear Regression"}})
+
+    assert load_json(manifest_path) == {
+        "ingestion": {"rows_ingested": 10},
+        "model": {"name": "Linear Regression"},
+    }
@@ -0,0 +1,58 @@
+import os
+
+import pandas as pd
+import pytest
+from fastapi.testclient import TestClient
+from sklearn.dummy import DummyRegressor
+
+import main
+from src.components.data_transformation import DataTransformation
+from src.utils import save_object
+
+STUD_CSV = os.path.join(os.path.dirname(__file__), "..", "notebook", "data", "stud.csv")
+
+FORM = {
+    "gender": "male",
+    "race_ethnicity": "group A",
+    "parental_level_of_education": "high school",
+    "lunch": "standard",
+    "test_preparation_course": "none",
+}
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    features = pd.read_csv(STUD_CSV).drop(columns=["math_score"])
+    preprocessor = DataTransformation().get_data_transformer_object()
+    x = preprocessor.fit_transform(features)
+    model_path = str(tmp_path / "multi_target" / "models.pkl")
+    save_object(
+        model_path,
+        {
+            "target_columns": ["math_score"],
+            "preprocessor": preprocessor,
+            "models": {"math_score": DummyRegressor().fit(x, [66.0] * len(x))},
+        },
+    )
+    monkeypatch.setattr(
+        main.predict_pipeline.predict_pipeline_config,
+        "multi_target_model_path",
+        model_path,
+    )
+    return TestClient(main.app)
+
+
+def test_predict_scores_rejects_missing_feature(client):
+    response = client.post("/predictscores", data={**FORM, "writing_score": 70})
+
+    assert response.status_code == 422
+    assert "reading_score" in response.json()["detail"]
+
+
+def test_predict_scores_predicts_every_target(client):
+    response = client.post(
+        "/predictscores", data={**FORM, "reading_score": 72, "writing_score": 70}
+    )
+
+    assert response.status_code == 200
+    assert response.json() == {"math_score": 66.0}
@@ -0,0 +1,40 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+from src.components.model_distiller import (
+    STUDENT_CATEGORICAL_LEVELS,
+    STUDENT_NUMERICAL_COLUMNS,
+    ModelDistiller,
+    prepare_student,
+    student_predict,
+)
+
+STUD_CSV = os.path.join(os.path.dirname(__file__), "..", "notebook", "data", "stud.csv")
+
+
+def test_student_predict_index_matches_domain_order():
+    train_df = pd.read_csv(STUD_CSV).iloc[:5]
+    domain_df, score_pairs = ModelDistiller().get_domain_dataframe(train_df)
+    n_combinations = int(
+        np.prod([len(levels) for levels in STUDENT_CATEGORICAL_LEVELS.values()])
+    )
+
+    # Intercept k for the k-th category combination and zero slopes, so each
+    # prediction is the coefficient row the lookup selected.
+    coefficients = np.zeros((n_combinations, 1 + len(STUDENT_NUMERICAL_COLUMNS)))
+    coefficients[:, 0] = np.arange(n_combinations)
+    student = prepare_student(
+        {
+            "categorical_levels": STUDENT_CATEGORICAL_LEVELS,
+            "numerical_columns": STUDENT_NUMERICAL_COLUMNS,
+            "coefficients": coefficients.tolist(),
+        }
+    )
+
+    shuffled_df = domain_df.sample(frac=1, random_state=0)
+    predictions = student_predict(student, shuffled_df)
+
+    expected = np.repeat(np.arange(n_combinations), len(score_pairs))
+    np.testing.assert_array_equal(predictions, expected[shuffled_df.index])
@@ -0,0 +1,63 @@
+import pytest
+
+from src.components.model_trainer import ModelTrainer, ModelTrainerConfig
+
+MODEL_REPORT = {
+    "CatBoost": 0.880,
+    "Gradient Boosting": 0.875,
+    "Linear Regression": 0.870,
+    "Decision Tree": 0.700,
+}
+MODEL_COSTS = {
+    "CatBoost": {"single_row_latency_ms": 2.0, "model_size_kb": 900.0},
+    "Gradient Boosting": {"single_row_latency_ms": 0.5, "model_size_kb": 300.0},
+    "Linear Regression": {"single_row_latency_ms": 0.1, "model_size_kb": 1.0},
+    "Decision Tree": {"single_row_latency_ms": 0.05, "model_size_kb": 20.0},
+}
+
+
+def test_select_best_model_picks_cheapest_within_tolerance():
+    model_trainer = ModelTrainer(ModelTrainerConfig(r2_tolerance=0.01))
+
+    name, selection = model_trainer.select_best_model(MODEL_REPORT, MODEL_COSTS)
+
+    # Decision Tree is cheapest but outside the band below the top score.
+    assert name == "Linear Regression"
+    assert selection["within_tolerance"] == [
+        "CatBoost",
+        "Gradient Boosting",
+        "Linear Regression",
+    ]
+    assert selection["r2_given_up"] == pytest.approx(0.010)
+
+
+def test_select_best_model_narrower_tolerance_keeps_accurate_models():
+    model_trainer = ModelTrainer(ModelTrainerConfig(r2_tolerance=0.005))
+
+    name, selection = model_trainer.select_best_model(MODEL_REPORT, MODEL_COSTS)
+
+    assert name == "Gradient Boosting"
+    assert selection["within_tolerance"] == ["CatBoost", "Gradient Boosting"]
+
+
+def test_select_best_model_excludes_models_over_budget():
+    model_trainer = ModelTrainer(
+        ModelTrainerConfig(r2_tolerance=0.0, max_model_size_kb=500.0)
+    )
+
+    name, selection = model_trainer.select_best_model(MODEL_REPORT, MODEL_COSTS)
+
+    # CatBoost is the most accurate but too large to serve, so the band is
+    # measured from Gradient Boosting while R2 given up is from CatBoost.
+    assert name == "Gradient Boosting"
+    assert "CatBoost" not in selection["eligible_models"]
+    assert selection["overall_best_model"] == "CatBoost"
+    assert selection["top_eligible_r2_score"] == MODEL_REPORT["Gradient Boosting"]
+    assert selection["r2_given_up"] == pytest.approx(0.005)
+
+
+def test_select_best_model_raises_when_nothing_is_eligible():
+    model_trainer = ModelTrainer(ModelTrainerConfig(max_single_row_latency_ms=0.01))
+
+    with pytest.raises(ValueError):
+        model_trainer.select_best_model(MODEL_REPORT, MODEL_COSTS)
@@ -0,0 +1,53 @@
+import os
+
+import pandas as pd
+import pytest
+from sklearn.dummy import DummyRegressor
+
+from src.components.data_transformation import DataTransformation
+from src.exception import CustomException
+from src.pipeline.predict_pipeline import PredictPipeline, PredictPipelineConfig
+from src.utils import save_object
+
+STUD_CSV = os.path.join(os.path.dirname(__file__), "..", "notebook", "data", "stud.csv")
+
+
+@pytest.fixture
+def features():
+    return pd.read_csv(STUD_CSV).drop(columns=["math_score"]).iloc[:3]
+
+
+def save_bundle(model_path, features, constant):
+    preprocessor = DataTransformation().get_data_transformer_object()
+    x = preprocessor.fit_transform(features)
+    model = DummyRegressor(strategy="constant", constant=constant).fit(
+        x, [constant] * len(x)
+    )
+    save_object(model_path, {"model": model, "preprocessor": preprocessor})
+
+
+def test_predict_reloads_replaced_bundle(tmp_path, features):
+    model_path = str(tmp_path / "model.pkl")
+    predict_pipeline = PredictPipeline()
+    predict_pipeline.predict_pipeline_config = PredictPipelineConfig(
+        model_path=model_path, serving_model="teacher"
+    )
+
+    save_bundle(model_path, features, 50.0)
+    assert list(predict_pipeline.predict(features)) == [50.0] * 3
+
+    save_bundle(model_path, features, 70.0)
+    assert list(predict_pipeline.predict(features)) == [70.0] * 3
+    assert not [name for name in os.listdir(tmp_path) if name.endswith(".tmp")]
+
+
+def test_predict_rejects_bare_model_without_refit(tmp_path, features):
+    model_path = str(tmp_path / "model.pkl")
+    save_object(model_path, DummyRegressor().fit([[0]], [0]))
+    predict_pipeline = PredictPipeline()
+    predict_pipeline.predict_pipeline_config = PredictPipelineConfig(
+        model_path=model_path, serving_model="teacher", fit_missing_preprocessor=False
+    )
+
+    with pytest.raises(CustomException, match="no bundled preprocessor"):
+        predict_pipeline.predict(features)
@@ -0,0 +1,69 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.dummy import DummyRegressor
+
+from src.components.data_transformation import DataTransformation
+from src.pipeline.shadow_pipeline import ShadowPipeline, ShadowPipelineConfig
+from src.utils import save_object
+
+STUD_CSV = os.path.join(os.path.dirname(__file__), "..", "notebook", "data", "stud.csv")
+
+
+@pytest.fixture
+def features():
+    return pd.read_csv(STUD_CSV).drop(columns=["math_score"]).iloc[:1]
+
+
+@pytest.fixture
+def shadow_pipeline(tmp_path, features):
+    preprocessor = DataTransformation().get_data_transformer_object()
+    x = preprocessor.fit_transform(features)
+    candidate_model_path = str(tmp_path / "candidate" / "model.pkl")
+    save_object(
+        candidate_model_path,
+        {"model": DummyRegressor().fit(x, [60.0]), "preprocessor": preprocessor},
+    )
+    return ShadowPipeline(
+        ShadowPipelineConfig(
+            candidate_model_path=candidate_model_path,
+            shadow_fraction=1.0,
+            buffer_size=5,
+        )
+    )
+
+
+def test_summary_keeps_only_the_latest_records(shadow_pipeline, features):
+    for i in range(8):
+        shadow_pipeline.evaluate(features, 59.0 + i, float(i + 1), "teacher")
+
+    summary = shadow_pipeline.summary()
+
+    # Records 3..7 remain: primary predictions 62..66 against a constant 60.
+    assert summary["enabled"]
+    assert summary["last_error"] is None
+    assert summary["samples"] == 5
+    assert summary["primary_serving_model"] == "teacher"
+    assert summary["mean_delta"] == pytest.approx(-4.0)
+    assert summary["max_abs_delta"] == pytest.approx(6.0)
+    assert summary["agreement_rate"] == 0.0
+    for q in (50, 95, 99):
+        assert summary[f"primary_latency_ms_p{q}"] == pytest.approx(
+            np.percentile([4.0, 5.0, 6.0, 7.0, 8.0], q)
+        )
+        assert summary[f"candidate_latency_ms_p{q}"] >= 0
+
+
+def test_summary_restarts_when_primary_serving_model_changes(
+    shadow_pipeline, features
+):
+    shadow_pipeline.evaluate(features, 60.0, 1.0, "teacher")
+    shadow_pipeline.evaluate(features, 60.5, 1.0, "student")
+
+    summary = shadow_pipeline.summary()
+
+    assert summary["samples"] == 1
+    assert summary["primary_serving_model"] == "student"
+    assert summary["agreement_rate"] == 1.0